@@ -3,6 +3,9 @@ Flask Web Application demonstrating the Simple RDBMS
 A task management system using our custom database
 """
 
+import threading
+from typing import Dict, Optional
+
 from flask import Flask, render_template, request, redirect, url_for, flash
 from database_engine import DatabaseEngine
 from rdbms import Column, DataType, Constraint
@@ -13,8 +16,45 @@ app.secret_key = 'simple-rdbms-demo-secret-key'
 # Initialize database and create tables
 engine = DatabaseEngine()
 
+# Next primary key per table, seeded from MAX(id) in init_database()
+_next_id: Dict[str, int] = {}
+_id_lock = threading.Lock()
+
+def _allocate_id(table_name: str) -> int:
+    """Reserve the next primary key for a table"""
+    with _id_lock:
+        next_id = _next_id[table_name]
+        _next_id[table_name] = next_id + 1
+    return next_id
+
+def _release_id(table_name: str, allocated_id: int):
+    """Give back an id whose INSERT failed, unless a newer one was handed out"""
+    with _id_lock:
+        if _next_id[table_name] == allocated_id + 1:
+            _next_id[table_name] = allocated_id
+
+# users.id -> users.name for the task list, rebuilt after any user change
+_user_names: Optional[Dict[int, str]] = None
+_user_names_lock = threading.Lock()
+
+def _get_user_names() -> Dict[int, str]:
+    """Return the cached user name lookup, building it on first use"""
+    global _user_names
+    with _user_names_lock:
+        if _user_names is None:
+            users = engine.execute("SELECT * FROM users").data or []
+            _user_names = {user['id']: user['name'] for user in users}
+        return _user_names
+
+def _invalidate_user_names():
+    """Drop the cached user name lookup after users change"""
+    global _user_names
+    with _user_names_lock:
+        _user_names = None
+
 def init_database():
-    """Initialize the database with sample tables"""
+    """Initialize the database with sample tables (safe to call more than once)"""
+    existing_tables = engine.database.list_tables()
     
     # Create users table
     create_users_sql = """
@@ -24,7 +64,8 @@ def init_database():
         email TEXT UNIQUE
     )
     """
-    engine.execute(create_users_sql)
+    if 'users' not in existing_tables:
+        engine.execute(create_users_sql)
     
     # Create tasks table
     create_tasks_sql = """
@@ -36,37 +77,55 @@ def init_database():
         user_id INT
     )
     """
-    engine.execute(create_tasks_sql)
+    if 'tasks' not in existing_tables:
+        engine.execute(create_tasks_sql)
     
     # Insert sample data
     sample_users = [
-        "INSERT INTO users (id, name, email) VALUES (1, 'Alice Johnson', 'alice@example.com')",
-        "INSERT INTO users (id, name, email) VALUES (2, 'Bob Smith', 'bob@example.com')",
-        "INSERT INTO users (id, name, email) VALUES (3, 'Carol Davis', 'carol@example.com')"
+        {'id': 1, 'name': 'Alice Johnson', 'email': 'alice@example.com'},
+        {'id': 2, 'name': 'Bob Smith', 'email': 'bob@example.com'},
+        {'id': 3, 'name': 'Carol Davis', 'email': 'carol@example.com'}
     ]
     
     sample_tasks = [
-        "INSERT INTO tasks (id, title, description, status, user_id) VALUES (1, 'Complete project', 'Finish the RDBMS project', 'in_progress', 1)",
-        "INSERT INTO tasks (id, title, description, status, user_id) VALUES (2, 'Write documentation', 'Create user manual', 'pending', 2)",
-        "INSERT INTO tasks (id, title, description, status, user_id) VALUES (3, 'Test application', 'Run unit tests', 'completed', 1)",
-        "INSERT INTO tasks (id, title, description, status, user_id) VALUES (4, 'Deploy to production', 'Deploy the web app', 'pending', 3)"
+        {'id': 1, 'title': 'Complete project', 'description': 'Finish the RDBMS project', 'status': 'in_progress', 'user_id': 1},
+        {'id': 2, 'title': 'Write documentation', 'description': 'Create user manual', 'status': 'pending', 'user_id': 2},
+        {'id': 3, 'title': 'Test application', 'description': 'Run unit tests', 'status': 'completed', 'user_id': 1},
+        {'id': 4, 'title': 'Deploy to production', 'description': 'Deploy the web app', 'status': 'pending', 'user_id': 3}
     ]
     
-    for sql in sample_users + sample_tasks:
-        engine.execute(sql)
+    # Only seed empty tables
+    if engine.database.get_table('users').row_count == 0:
+        engine.execute_many('users', sample_users)
+    if engine.database.get_table('tasks').row_count == 0:
+        engine.execute_many('tasks', sample_tasks)
+    
+    # Seed the id counters with one scan per table
+    for table_name in ['users', 'tasks']:
+        rows = engine.execute(f"SELECT * FROM {table_name}").data or []
+        _next_id[table_name] = max([row['id'] for row in rows], default=0) + 1
+
+# Set up lazily so importing the module (e.g. the reloader's parent process) does no work
+_database_ready = False
+_database_lock = threading.Lock()
 
-# Initialize database on startup
-init_database()
+@app.before_request
+def ensure_database():
+    """Initialize the database once per process, before its first request"""
+    global _database_ready
+    if _database_ready:
+        return
+    with _database_lock:
+        if not _database_ready:
+            init_database()
+            _database_ready = True
 
 @app.route('/')
 def index():
     """Home page showing overview"""
-    # Get counts
-    users_result = engine.execute("SELECT * FROM users")
-    tasks_result = engine.execute("SELECT * FROM tasks")
-    
-    user_count = len(users_result.data) if users_result.data else 0
-    task_count = len(tasks_result.data) if tasks_result.data else 0
+    # Get counts from the tables directly instead of loading every row
+    user_count = engine.database.get_table('users').row_count
+    task_count = engine.database.get_table('tasks').row_count
     
     # Get recent tasks
     recent_tasks = engine.execute("SELECT * FROM tasks ORDER BY id DESC LIMIT 5")
@@ -100,17 +159,17 @@ def create_user():
         return redirect(url_for('new_user_form'))
     
     # Get next ID
-    result = engine.execute("SELECT * FROM users")
-    users = result.data if result.data else []
-    next_id = max([user['id'] for user in users], default=0) + 1
+    next_id = _allocate_id('users')
     
     # Insert user
-    sql = f"INSERT INTO users (id, name, email) VALUES ({next_id}, '{name}', '{email or ''}')"
-    result = engine.execute(sql)
+    sql = "INSERT INTO users (id, name, email) VALUES (?, ?, ?)"
+    result = engine.execute(sql, (next_id, name, email or ''))
     
     if result.success:
+        _invalidate_user_names()
         flash('User created successfully', 'success')
     else:
+        _release_id('users', next_id)
         flash(f'Error creating user: {result.message}', 'error')
     
     return redirect(url_for('list_users'))
@@ -118,7 +177,7 @@ def create_user():
 @app.route('/users/<int:user_id>/edit')
 def edit_user_form(user_id):
     """Show form to edit user"""
-    result = engine.execute(f"SELECT * FROM users WHERE id = {user_id}")
+    result = engine.get_by_id('users', user_id)
     user = result.data[0] if result.data else None
     
     if not user:
@@ -138,10 +197,10 @@ def update_user(user_id):
         return redirect(url_for('edit_user_form', user_id=user_id))
     
     # Update user
-    sql = f"UPDATE users SET name = '{name}', email = '{email or ''}' WHERE id = {user_id}"
-    result = engine.execute(sql)
+    result = engine.update_by_id('users', user_id, {'name': name, 'email': email or ''})
     
     if result.success:
+        _invalidate_user_names()
         flash('User updated successfully', 'success')
     else:
         flash(f'Error updating user: {result.message}', 'error')
@@ -152,10 +211,11 @@ def update_user(user_id):
 def delete_user(user_id):
     """Delete a user"""
     # First delete associated tasks
-    engine.execute(f"DELETE FROM tasks WHERE user_id = {user_id}")
+    engine.delete_by_index('tasks', 'user_id', user_id)
     
     # Then delete user
-    result = engine.execute(f"DELETE FROM users WHERE id = {user_id}")
+    result = engine.delete_by_id('users', user_id)
+    _invalidate_user_names()
     
     if result.success:
         flash('User deleted successfully', 'success')
@@ -167,15 +227,11 @@ def delete_user(user_id):
 @app.route('/tasks')
 def list_tasks():
     """List all tasks with user information"""
-    # Get tasks and users separately, then join manually
+    # Get tasks, then join manually against the cached user lookup
     tasks_result = engine.execute("SELECT * FROM tasks")
-    users_result = engine.execute("SELECT * FROM users")
-    
     tasks = tasks_result.data if tasks_result.data else []
-    users = users_result.data if users_result.data else []
     
-    # Create user lookup dictionary
-    user_lookup = {user['id']: user['name'] for user in users}
+    user_lookup = _get_user_names()
     
     # Add user_name to each task
     for task in tasks:
@@ -198,7 +254,7 @@ def create_task():
     title = request.form.get('title')
     description = request.form.get('description')
     status = request.form.get('status', 'pending')
-    user_id = request.form.get('user_id')
+    user_id = request.form.get('user_id', type=int)
     
     if not title:
         flash('Title is required', 'error')
@@ -209,17 +265,16 @@ def create_task():
         return redirect(url_for('new_task_form'))
     
     # Get next ID
-    result = engine.execute("SELECT * FROM tasks")
-    tasks = result.data if result.data else []
-    next_id = max([task['id'] for task in tasks], default=0) + 1
+    next_id = _allocate_id('tasks')
     
     # Insert task
-    sql = f"INSERT INTO tasks (id, title, description, status, user_id) VALUES ({next_id}, '{title}', '{description or ''}', '{status}', {user_id})"
-    result = engine.execute(sql)
+    sql = "INSERT INTO tasks (id, title, description, status, user_id) VALUES (?, ?, ?, ?, ?)"
+    result = engine.execute(sql, (next_id, title, description or '', status, user_id))
     
     if result.success:
         flash('Task created successfully', 'success')
     else:
+        _release_id('tasks', next_id)
         flash(f'Error creating task: {result.message}', 'error')
     
     return redirect(url_for('list_tasks'))
@@ -228,7 +283,7 @@ def create_task():
 def edit_task_form(task_id):
     """Show form to edit task"""
     # Get task
-    task_result = engine.execute(f"SELECT * FROM tasks WHERE id = {task_id}")
+    task_result = engine.get_by_id('tasks', task_id)
     task = task_result.data[0] if task_result.data else None
     
     if not task:
@@ -247,7 +302,7 @@ def update_task(task_id):
     title = request.form.get('title')
     description = request.form.get('description')
     status = request.form.get('status')
-    user_id = request.form.get('user_id')
+    user_id = request.form.get('user_id', type=int)
     
     if not title:
         flash('Title is required', 'error')
@@ -258,8 +313,12 @@ def update_task(task_id):
         return redirect(url_for('edit_task_form', task_id=task_id))
     
     # Update task
-    sql = f"UPDATE tasks SET title = '{title}', description = '{description or ''}', status = '{status}', user_id = {user_id} WHERE id = {task_id}"
-    result = engine.execute(sql)
+    result = engine.update_by_id('tasks', task_id, {
+        'title': title,
+        'description': description or '',
+        'status': status,
+        'user_id': user_id
+    })
     
     if result.success:
         flash('Task updated successfully', 'success')
@@ -271,7 +330,7 @@ def update_task(task_id):
 @app.route('/tasks/<int:task_id>/delete', methods=['POST'])
 def delete_task(task_id):
     """Delete a task"""
-    result = engine.execute(f"DELETE FROM tasks WHERE id = {task_id}")
+    result = engine.delete_by_id('tasks', task_id)
     
     if result.success:
         flash('Task deleted successfully', 'success')
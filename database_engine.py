@@ -3,14 +3,26 @@ Database Engine for Simple RDBMS
 Executes SQL commands and manages the database operations
 """
 
-from typing import Dict, List, Any, Optional, Union
+import csv
+from typing import Dict, List, Any, Optional, Union, Tuple, Sequence
 from dataclasses import dataclass
+from functools import lru_cache
 
-from rdbms import Database, Table, Column, DataType, Constraint
+from rdbms import Database, Table, Column, DataType, Constraint, order_positions
 from sql_parser import SQLParser, CreateTableCommand, InsertCommand, SelectCommand, UpdateCommand, DeleteCommand
 
+# Conversion of CSV text fields to each column data type
+_CSV_CONVERTERS = {
+    DataType.INT: int,
+    DataType.FLOAT: float,
+    DataType.TEXT: str
+}
 
-@dataclass
+# Which table of a JOIN a resolved column belongs to
+_LEFT, _RIGHT, _EITHER = 0, 1, 2
+
+
+@dataclass(slots=True)
 class QueryResult:
     """Represents the result of a query"""
     success: bool
@@ -22,14 +34,21 @@ class QueryResult:
 class DatabaseEngine:
     """Main database engine that executes SQL commands"""
     
+    # Number of distinct SQL strings whose parsed commands are kept
+    PARSE_CACHE_SIZE = 256
+    
     def __init__(self):
         self.database = Database()
         self.parser = SQLParser()
+        
+        # Repeated SQL strings reuse their parsed command; executors treat commands as read-only
+        self._parse_cached = lru_cache(maxsize=self.PARSE_CACHE_SIZE)(self.parser.parse)
     
-    def execute(self, sql: str) -> QueryResult:
-        """Execute a SQL command and return the result"""
+    def execute(self, sql: str, params: Optional[Sequence[Any]] = None) -> QueryResult:
+        """Execute a SQL command, binding ? placeholders to params, and return the result"""
         try:
-            command = self.parser.parse(sql)
+            # The cache is keyed by the SQL template, so every parameter set shares one parse
+            command = self.parser.bind_parameters(self._parse_cached(sql), params)
             
             if isinstance(command, CreateTableCommand):
                 return self._execute_create_table(command)
@@ -47,6 +66,89 @@ class DatabaseEngine:
         except Exception as e:
             return QueryResult(False, f"Error: {str(e)}")
     
+    def execute_many(self, table_name: str, rows: List[Dict[str, Any]]) -> QueryResult:
+        """Insert a batch of rows directly, without going through the SQL parser"""
+        try:
+            table = self.database.get_table(table_name)
+            row_ids = table.insert_many(rows)
+            
+            message = f"Inserted {len(row_ids)} rows into '{table_name}'"
+            return QueryResult(True, message, affected_rows=len(row_ids))
+            
+        except Exception as e:
+            return QueryResult(False, f"Failed to insert: {str(e)}")
+    
+    def load_csv(self, path: str, table_name: str) -> QueryResult:
+        """Insert the rows of a CSV file whose header row names the columns, without going through the SQL parser"""
+        try:
+            table = self.database.get_table(table_name)
+            
+            with open(path, newline='') as csv_file:
+                reader = csv.reader(csv_file)
+                col_names = [col.strip() for col in next(reader, [])]
+                for col_name in col_names:
+                    if col_name not in table.columns:
+                        raise ValueError(f"Unknown column: {col_name}")
+                
+                # CSV fields are text; convert them to each column's type, with empty fields as NULL
+                converters = [_CSV_CONVERTERS[table.columns[col_name].data_type] for col_name in col_names]
+                rows = []
+                for record in reader:
+                    if not record:
+                        continue
+                    if len(record) != len(converters):
+                        raise ValueError(f"Line {reader.line_num}: expected {len(converters)} fields, got {len(record)}")
+                    rows.append(tuple(convert(value) if value != '' else None
+                                      for convert, value in zip(converters, record)))
+            
+            row_ids = table.insert_tuples(col_names, rows)
+            
+            message = f"Loaded {len(row_ids)} rows into '{table_name}'"
+            return QueryResult(True, message, affected_rows=len(row_ids))
+            
+        except Exception as e:
+            return QueryResult(False, f"Failed to load: {str(e)}")
+    
+    def get_by_id(self, table_name: str, record_id: Any) -> QueryResult:
+        """Select rows by their id column without going through the SQL parser"""
+        try:
+            table = self.database.get_table(table_name)
+            rows = table.find_rows({'id': record_id})
+            
+            message = f"Selected {len(rows)} rows from '{table_name}'"
+            return QueryResult(True, message, data=rows)
+            
+        except Exception as e:
+            return QueryResult(False, f"Failed to select: {str(e)}")
+    
+    def update_by_id(self, table_name: str, record_id: Any, set_values: Dict[str, Any]) -> QueryResult:
+        """Update rows by their id column without going through the SQL parser"""
+        try:
+            table = self.database.get_table(table_name)
+            updated_count = table.update_rows({'id': record_id}, set_values)
+            
+            message = f"Updated {updated_count} rows in '{table_name}'"
+            return QueryResult(True, message, affected_rows=updated_count)
+            
+        except Exception as e:
+            return QueryResult(False, f"Failed to update: {str(e)}")
+    
+    def delete_by_id(self, table_name: str, record_id: Any) -> QueryResult:
+        """Delete rows by their id column without going through the SQL parser"""
+        return self.delete_by_index(table_name, 'id', record_id)
+    
+    def delete_by_index(self, table_name: str, col_name: str, value: Any) -> QueryResult:
+        """Delete rows where col_name equals value using that column's hash index"""
+        try:
+            table = self.database.get_table(table_name)
+            deleted_count = table.delete_rows_by_index(col_name, value)
+            
+            message = f"Deleted {deleted_count} rows from '{table_name}'"
+            return QueryResult(True, message, affected_rows=deleted_count)
+            
+        except Exception as e:
+            return QueryResult(False, f"Failed to delete: {str(e)}")
+    
     def _execute_create_table(self, command: CreateTableCommand) -> QueryResult:
         """Execute CREATE TABLE command"""
         try:
@@ -74,6 +176,16 @@ class DatabaseEngine:
         """Execute INSERT command"""
         try:
             table = self.database.get_table(command.table_name)
+            
+            if command.more_values:
+                # Every row names the same columns, so load them column-wise in one batch
+                col_names = list(command.values)
+                rows = [tuple(values.values()) for values in [command.values] + command.more_values]
+                row_ids = table.insert_tuples(col_names, rows)
+                
+                message = f"Inserted {len(row_ids)} rows into '{command.table_name}'"
+                return QueryResult(True, message, affected_rows=len(row_ids))
+            
             row_id = table.insert_row(command.values)
             
             message = f"Inserted 1 row into '{command.table_name}' (ID: {row_id})"
@@ -91,19 +203,11 @@ class DatabaseEngine:
             if command.join_table:
                 return self._execute_join_select(command)
             
-            # Get rows matching WHERE conditions
-            rows = table.find_rows(command.where_conditions)
-            
-            # Filter columns if not SELECT *
-            if command.columns != ['*']:
-                filtered_rows = []
-                for row in rows:
-                    filtered_row = {}
-                    for col in command.columns:
-                        if col in row:
-                            filtered_row[col] = row[col]
-                    filtered_rows.append(filtered_row)
-                rows = filtered_rows
+            # Get rows matching WHERE conditions, built only from the selected columns
+            columns = None if command.columns == ['*'] else command.columns
+            rows = table.find_rows(command.where_conditions, columns,
+                                   order_by=command.order_by, descending=command.order_desc,
+                                   limit=command.limit)
             
             message = f"Selected {len(rows)} rows from '{command.table_name}'"
             return QueryResult(True, message, data=rows)
@@ -117,89 +221,98 @@ class DatabaseEngine:
             left_table = self.database.get_table(command.table_name)
             right_table = self.database.get_table(command.join_table)
             
-            left_rows = left_table.find_rows()
-            right_rows = right_table.find_rows()
-            
-            # Simple inner join implementation
-            joined_rows = []
-            
-            for left_row in left_rows:
-                for right_row in right_rows:
-                    # Check join conditions
-                    match = True
-                    if command.join_conditions:
-                        for col, value in command.join_conditions.items():
-                            # Handle table.column notation
-                            if '.' in col:
-                                table_name, col_name = col.split('.')
-                                if table_name == command.table_name:
-                                    if left_row.get(col_name) != value:
-                                        match = False
-                                        break
-                                elif table_name == command.join_table:
-                                    if right_row.get(col_name) != value:
-                                        match = False
-                                        break
-                            else:
-                                # Try to find the column in either table
-                                if col in left_row and left_row[col] != value:
-                                    match = False
-                                    break
-                                elif col in right_row and right_row[col] != value:
-                                    match = False
-                                    break
-                    
-                    if match:
-                        # Apply WHERE conditions
-                        if command.where_conditions:
-                            where_match = True
-                            for col, value in command.where_conditions.items():
-                                if '.' in col:
-                                    table_name, col_name = col.split('.')
-                                    if table_name == command.table_name:
-                                        if left_row.get(col_name) != value:
-                                            where_match = False
-                                            break
-                                    elif table_name == command.join_table:
-                                        if right_row.get(col_name) != value:
-                                            where_match = False
-                                            break
-                                else:
-                                    if col in left_row and left_row[col] != value:
-                                        where_match = False
-                                        break
-                                    elif col in right_row and right_row[col] != value:
-                                        where_match = False
-                                        break
-                            
-                            if not where_match:
-                                continue
-                        
-                        # Merge rows
-                        joined_row = {}
-                        
-                        # Add left table columns with prefix
-                        for col, value in left_row.items():
-                            if col != '_row_id':
-                                joined_row[f"{command.table_name}.{col}"] = value
-                        
-                        # Add right table columns with prefix
-                        for col, value in right_row.items():
-                            if col != '_row_id':
-                                joined_row[f"{command.join_table}.{col}"] = value
-                        
-                        joined_rows.append(joined_row)
+            # The parser already assigned qualified WHERE conditions to a table; resolve the rest once
+            where_conditions = ([(_LEFT, col, value) for col, value in (command.left_where or {}).items()]
+                                + [(_RIGHT, col, value) for col, value in (command.right_where or {}).items()]
+                                + self._resolve_conditions(command, command.where_conditions))
+            join_keys, residual_conditions = self._resolve_join_keys(command, left_table, right_table)
+            
+            # Push WHERE and the remaining ON conditions down so each table is filtered before the join
+            left_where, right_where = self._split_conditions(where_conditions, left_table, right_table)
+            left_on, right_on = self._split_conditions(residual_conditions, left_table, right_table)
+            left_conditions = self._combine_conditions(left_where, left_on)
+            right_conditions = self._combine_conditions(right_where, right_on)
+            
+            left_cols = [left_col for left_col, _ in join_keys]
+            right_cols = [right_col for _, right_col in join_keys]
+            
+            # An unfiltered side already indexed on its join column serves as the hash table
+            index_side = None
+            if len(join_keys) == 1:
+                right_indexed = right_conditions == {} and right_cols[0] in right_table.indexes
+                left_indexed = left_conditions == {} and left_cols[0] in left_table.indexes
+                if right_indexed and (not left_indexed or left_table.row_count <= right_table.row_count):
+                    index_side = _RIGHT
+                elif left_indexed:
+                    index_side = _LEFT
+            
+            # The indexed side is only probed, so its positions are never gathered
+            left_positions: List[int] = []
+            right_positions: List[int] = []
+            if index_side != _LEFT and left_conditions is not None:
+                left_positions = left_table.find_positions(left_conditions)
+            if index_side != _RIGHT and right_conditions is not None:
+                right_positions = right_table.find_positions(right_conditions)
+            
+            if index_side == _RIGHT:
+                left_keys = self._join_key_values(left_table, left_positions, left_cols)
+                left_matches, right_matches = self._index_join(left_positions, left_keys, right_table, right_cols[0])
+            elif index_side == _LEFT:
+                right_keys = self._join_key_values(right_table, right_positions, right_cols)
+                right_matches, left_matches = self._index_join(right_positions, right_keys, left_table, left_cols[0])
+            elif join_keys:
+                left_keys = self._join_key_values(left_table, left_positions, left_cols)
+                right_keys = self._join_key_values(right_table, right_positions, right_cols)
+                left_matches, right_matches = self._hash_join(left_keys, right_keys)
+                left_matches = [left_positions[i] for i in left_matches]
+                right_matches = [right_positions[i] for i in right_matches]
+            else:
+                # No equi-join condition, fall back to the cartesian product
+                left_matches = [position for position in left_positions for _ in right_positions]
+                right_matches = right_positions * len(left_positions)
+            
+            # Output columns, prefixed with their table name
+            output = []
+            for col_name in left_table.columns:
+                output.append((f"{command.table_name}.{col_name}", left_table.columns_data[col_name], True))
+            for col_name in right_table.columns:
+                output.append((f"{command.join_table}.{col_name}", right_table.columns_data[col_name], False))
+            by_name = {entry[0]: entry for entry in output}
+            
+            # Apply ORDER BY and LIMIT to the matched pairs before building any rows
+            if command.order_by is not None:
+                side, col_name = self._resolve_column(command, command.order_by) or (None, None)
+                if side == _EITHER:
+                    # An unqualified column must belong to exactly one of the tables
+                    in_left = col_name in left_table.columns
+                    if in_left and col_name in right_table.columns:
+                        raise ValueError(f"Ambiguous column: {command.order_by}")
+                    side = _LEFT if in_left else _RIGHT
+                order_table = left_table if side == _LEFT else right_table
+                if side is None or col_name not in order_table.columns:
+                    raise ValueError(f"Unknown column: {command.order_by}")
+                values = order_table.columns_data[col_name]
+                matches = left_matches if side == _LEFT else right_matches
+                order = order_positions(range(len(matches)), [values[i] for i in matches],
+                                        command.order_desc, command.limit)
+                left_matches = [left_matches[i] for i in order]
+                right_matches = [right_matches[i] for i in order]
+            elif command.limit is not None:
+                left_matches = left_matches[:command.limit]
+                right_matches = right_matches[:command.limit]
             
             # Filter columns if not SELECT *
             if command.columns != ['*']:
-                filtered_rows = []
-                for row in joined_rows:
-                    filtered_row = {}
-                    for col in command.columns:
-                        if col in row:
-                            filtered_row[col] = row[col]
-                    filtered_rows.append(filtered_row)
-                joined_rows = filtered_rows
+                output = [by_name[col] for col in command.columns if col in by_name]
+            
+            # Build the rows one column at a time from the matched positions
+            keys = [name for name, _, _ in output]
+            columns = [[values[i] for i in (left_matches if from_left else right_matches)]
+                       for _, values, from_left in output]
+            if keys:
+                joined_rows = [dict(zip(keys, row_values)) for row_values in zip(*columns)]
+            else:
+                joined_rows = [{} for _ in left_matches]
             
             message = f"Selected {len(joined_rows)} rows from JOIN of '{command.table_name}' and '{command.join_table}'"
             return QueryResult(True, message, data=joined_rows)
@@ -207,6 +320,121 @@ class DatabaseEngine:
         except Exception as e:
             return QueryResult(False, f"Failed to join: {str(e)}")
     
+    def _resolve_column(self, command: SelectCommand, col: str) -> Optional[Tuple[int, str]]:
+        """Resolve a possibly table-qualified column to (side, column name), or None for another table"""
+        if '.' not in col:
+            return _EITHER, col
+        
+        table_name, col_name = col.split('.', 1)
+        if table_name == command.table_name:
+            return _LEFT, col_name
+        if table_name == command.join_table:
+            return _RIGHT, col_name
+        return None
+    
+    def _resolve_conditions(self, command: SelectCommand,
+                            conditions: Optional[Dict[str, Any]]) -> List[Tuple[int, str, Any]]:
+        """Resolve conditions of a JOIN to (side, column name, value) triples"""
+        resolved = []
+        for col, value in (conditions or {}).items():
+            column = self._resolve_column(command, col)
+            if column:
+                resolved.append((column[0], column[1], value))
+        return resolved
+    
+    def _split_conditions(self, conditions: List[Tuple[int, str, Any]], left_table: Table,
+                          right_table: Table) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Split resolved conditions of a JOIN into per-table conditions (None for a side that matches nothing)"""
+        left_conditions: Optional[Dict[str, Any]] = {}
+        right_conditions: Optional[Dict[str, Any]] = {}
+        
+        for side, col_name, value in conditions:
+            # Unqualified column filters every table that has it
+            if side == _LEFT or (side == _EITHER and col_name in left_table.columns):
+                left_conditions = self._combine_conditions(left_conditions, {col_name: value})
+            if side == _RIGHT or (side == _EITHER and col_name in right_table.columns):
+                right_conditions = self._combine_conditions(right_conditions, {col_name: value})
+        
+        return left_conditions, right_conditions
+    
+    def _combine_conditions(self, first: Optional[Dict[str, Any]],
+                            second: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Merge two sets of conditions, or return None if they contradict each other"""
+        if first is None or second is None:
+            return None
+        combined = dict(first)
+        for col, value in second.items():
+            if col in combined and combined[col] != value:
+                return None
+            combined[col] = value
+        return combined
+    
+    def _resolve_join_keys(self, command: SelectCommand, left_table: Table,
+                           right_table: Table) -> Tuple[List[Tuple[str, str]], List[Tuple[int, str, Any]]]:
+        """Split ON conditions into (left column, right column) equi-join keys and resolved residual conditions"""
+        join_keys = []
+        residual_conditions = []
+        
+        for side, col_name, value in self._resolve_conditions(command, command.join_conditions):
+            # An equi-join compares a column of one table with a column of the other
+            other = self._resolve_column(command, value) if isinstance(value, str) else None
+            if other and side != _EITHER and {side, other[0]} == {_LEFT, _RIGHT}:
+                left_col, right_col = (col_name, other[1]) if side == _LEFT else (other[1], col_name)
+                if left_col in left_table.columns and right_col in right_table.columns:
+                    join_keys.append((left_col, right_col))
+                    continue
+            
+            residual_conditions.append((side, col_name, value))
+        
+        return join_keys, residual_conditions
+    
+    def _join_key_values(self, table: Table, positions: List[int], col_names: List[str]) -> List[Any]:
+        """Gather join keys at the given positions (tuples for multi-column keys)"""
+        columns = [table.columns_data[col_name] for col_name in col_names]
+        if len(columns) == 1:
+            values = columns[0]
+            return [values[i] for i in positions]
+        return [tuple(values[i] for values in columns) for i in positions]
+    
+    def _hash_join(self, left_keys: List[Any], right_keys: List[Any]) -> Tuple[List[int], List[int]]:
+        """Match equal keys using a hash table on the smaller side, returning aligned index lists"""
+        build_left = len(left_keys) <= len(right_keys)
+        build_keys, probe_keys = (left_keys, right_keys) if build_left else (right_keys, left_keys)
+        
+        # Build phase: NULL never equals anything, so NULL keys are left out
+        buckets: Dict[Any, List[int]] = {}
+        for i, key in enumerate(build_keys):
+            if key is None or (isinstance(key, tuple) and None in key):
+                continue
+            buckets.setdefault(key, []).append(i)
+        
+        # Probe phase
+        build_matches = []
+        probe_matches = []
+        for j, key in enumerate(probe_keys):
+            matches = buckets.get(key)
+            if matches:
+                build_matches.extend(matches)
+                probe_matches.extend([j] * len(matches))
+        
+        if build_left:
+            return build_matches, probe_matches
+        return probe_matches, build_matches
+    
+    def _index_join(self, probe_positions: List[int], probe_keys: List[Any], table: Table,
+                    col_name: str) -> Tuple[List[int], List[int]]:
+        """Look probe keys up in an existing index of table, returning aligned (probe, table) positions"""
+        probe_matches = []
+        table_matches = []
+        for position, key in zip(probe_positions, probe_keys):
+            if key is None:
+                continue
+            matches = table.index_positions(col_name, key)
+            if matches:
+                table_matches.extend(matches)
+                probe_matches.extend([position] * len(matches))
+        return probe_matches, table_matches
+    
     def _execute_update(self, command: UpdateCommand) -> QueryResult:
         """Execute UPDATE command"""
         try:
@@ -239,7 +467,7 @@ class DatabaseEngine:
             info = {
                 'name': table.name,
                 'columns': [],
-                'row_count': len(table.rows),
+                'row_count': table.row_count,
                 'indexes': list(table.indexes.keys())
             }
             
@@ -3,6 +3,8 @@ Example Usage of Simple RDBMS
 Demonstrates basic database operations programmatically
 """
 
+from collections import Counter, defaultdict
+
 from database_engine import DatabaseEngine
 
 def main():
@@ -79,10 +81,14 @@ def main():
     users_result = engine.execute("SELECT * FROM users")
     posts_result = engine.execute("SELECT * FROM posts")
     
+    # Group posts by author once instead of rescanning them for every user
+    posts_by_user = defaultdict(list)
+    for post in posts_result.data:
+        posts_by_user[post['user_id']].append(post)
+    
     print("\nUsers and their posts:")
     for user in users_result.data:
-        user_posts = [post for post in posts_result.data if post['user_id'] == user['id']]
-        for post in user_posts:
+        for post in posts_by_user[user['id']]:
             print(f"  {user['name']} wrote: {post['title']}")
     
     # 5. Update operations
@@ -123,12 +129,13 @@ def main():
     # 8. Complex queries
     print("\n🎯 Complex queries...")
     
-    # Count posts per user
+    # Count posts per user with one scan of posts rather than one query per user
     print("\nPosts per user:")
     users_result = engine.execute("SELECT * FROM users")
+    posts_result = engine.execute("SELECT * FROM posts")
+    post_counts = Counter(post['user_id'] for post in posts_result.data)
     for user in users_result.data:
-        posts_result = engine.execute(f"SELECT * FROM posts WHERE user_id = {user['id']}")
-        count = len(posts_result.data)
+        count = post_counts[user['id']]
         print(f"  {user['name']}: {count} posts")
     
     # 9. Database statistics
@@ -5,8 +5,11 @@ A minimal relational database management system built with Python
 
 import re
 import json
-from typing import Dict, List, Any, Optional, Union, Tuple
-from dataclasses import dataclass
+import heapq
+from array import array
+from itertools import islice
+from typing import Dict, List, Any, Optional, Union, Tuple, Set, Sequence, Iterator
+from dataclasses import dataclass, field
 from enum import Enum
 
 
@@ -24,169 +27,507 @@ class Constraint(Enum):
     NONE = "NONE"
 
 
-@dataclass
+# Python types each column data type accepts
+_ACCEPTED_TYPES = {
+    DataType.INT: int,
+    DataType.TEXT: str,
+    DataType.FLOAT: (int, float)
+}
+
+
+@dataclass(slots=True)
 class Column:
     """Represents a column definition in a table"""
     name: str
     data_type: DataType
     constraint: Constraint = Constraint.NONE
     nullable: bool = True
+    _accepted_types: Any = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # The data type is fixed, so resolve its Python types once rather than per value
+        self._accepted_types = _ACCEPTED_TYPES.get(self.data_type, ())
     
     def validate_value(self, value: Any) -> bool:
         """Validate if a value matches the column's data type"""
         if value is None:
             return self.nullable
-            
-        if self.data_type == DataType.INT:
-            return isinstance(value, int)
-        elif self.data_type == DataType.TEXT:
-            return isinstance(value, str)
-        elif self.data_type == DataType.FLOAT:
-            return isinstance(value, (int, float))
-        return False
+        return isinstance(value, self._accepted_types)
+
+
+def _scan_equal(values: List[Any], target: Any) -> List[int]:
+    """Find every position holding target, letting list.index do the comparisons in C"""
+    positions = []
+    find = values.index
+    position = -1
+    try:
+        while True:
+            position = find(target, position + 1)
+            positions.append(position)
+    except ValueError:
+        return positions
+
+
+def _iter_equal(values: List[Any], target: Any) -> Iterator[int]:
+    """Yield every position holding target in turn, letting list.index do the comparisons in C"""
+    find = values.index
+    position = -1
+    while True:
+        try:
+            position = find(target, position + 1)
+        except ValueError:
+            return
+        yield position
+
+
+def _refine_equal(positions: List[int], checks: List[Tuple[List[Any], Any]]) -> List[int]:
+    """Keep the positions whose values equal every (values, target) check, two checks per pass"""
+    while positions and len(checks) >= 2:
+        (first, first_target), (second, second_target) = checks[:2]
+        positions = [i for i in positions if first[i] == first_target and second[i] == second_target]
+        checks = checks[2:]
+    
+    if positions and checks:
+        values, target = checks[0]
+        positions = [i for i in positions if values[i] == target]
+    return positions
+
+
+def _compact(values: List[Any], deleted: List[int]) -> List[Any]:
+    """Copy values without the sorted deleted positions, one slice per gap between them"""
+    kept = values[:0]  # same container type as values
+    extend = kept.extend
+    start = 0
+    for position in deleted:
+        extend(values[start:position])
+        start = position + 1
+    extend(values[start:])
+    return kept
+
+
+def order_positions(positions: List[int], values: List[Any], descending: bool = False,
+                    limit: Optional[int] = None) -> List[int]:
+    """Order positions by values[position] (NULLs first ascending, last descending), keeping at most limit of them"""
+    if None in values:
+        sort_key = lambda position: (values[position] is not None, values[position])
+    else:
+        sort_key = values.__getitem__
+    
+    # A small LIMIT only needs a heap of that size, not a full sort
+    if limit is not None and limit < len(positions):
+        pick = heapq.nlargest if descending else heapq.nsmallest
+        return pick(limit, positions, key=sort_key)
+    return sorted(positions, key=sort_key, reverse=descending)
 
 
 class Index:
     """Simple hash-based index for fast lookups"""
     def __init__(self, column_name: str):
         self.column_name = column_name
-        self.index: Dict[Any, List[int]] = {}  # value -> list of row_ids
+        self.index: Dict[Any, Set[int]] = {}  # value -> set of row_ids
         
     def add(self, value: Any, row_id: int):
         """Add a value to the index"""
-        if value not in self.index:
-            self.index[value] = []
-        self.index[value].append(row_id)
+        row_ids = self.index.get(value)
+        if row_ids is None:
+            self.index[value] = {row_id}
+        else:
+            row_ids.add(row_id)
         
     def remove(self, value: Any, row_id: int):
         """Remove a value from the index"""
-        if value in self.index and row_id in self.index[value]:
-            self.index[value].remove(row_id)
-            if not self.index[value]:
+        row_ids = self.index.get(value)
+        if row_ids is not None:
+            row_ids.discard(row_id)
+            if not row_ids:
                 del self.index[value]
                 
-    def find(self, value: Any) -> List[int]:
+    def remove_many(self, values: List[Any], row_ids: List[int]):
+        """Remove several values from the index, updating each affected posting set once"""
+        removed: Dict[Any, Set[int]] = {}
+        for value, row_id in zip(values, row_ids):
+            ids = removed.get(value)
+            if ids is None:
+                removed[value] = {row_id}
+            else:
+                ids.add(row_id)
+        
+        for value, ids in removed.items():
+            posting = self.index.get(value)
+            if posting is not None:
+                posting.difference_update(ids)
+                if not posting:
+                    del self.index[value]
+                
+    def find(self, value: Any) -> Set[int]:
         """Find row IDs for a given value"""
-        return self.index.get(value, [])
+        return self.index.get(value, set())
+        
+    def contains(self, value: Any) -> bool:
+        """Check whether any row holds the given value"""
+        return value in self.index
 
 
 class Table:
     """Represents a database table"""
+    
+    # Equality filters on a column before it gets its own hash index
+    AUTO_INDEX_THRESHOLD = 3
+    
     def __init__(self, name: str, columns: List[Column]):
         self.name = name
         self.columns = {col.name: col for col in columns}
-        self.rows: List[Dict[str, Any]] = []
         self.indexes: Dict[str, Index] = {}
         self.next_row_id = 1
         
+        # Columnar storage: one list per column, aligned by position with row_ids,
+        # which are kept unboxed as 64-bit integers rather than one int object per row
+        self.row_ids: array = array('q')
+        self.columns_data: Dict[str, List[Any]] = {col.name: [] for col in columns}
+        self._row_keys = ['_row_id'] + list(self.columns)
+        self._positions: Dict[int, int] = {}  # row_id -> position in the column lists
+        
+        # How often each unindexed column was filtered on
+        self._filter_counts: Dict[str, int] = {}
+        
+        # Columns that must stay unique, resolved once as name -> is_primary_key
+        self._unique_columns: Dict[str, bool] = {
+            column.name: column.constraint == Constraint.PRIMARY_KEY
+            for column in columns
+            if column.constraint in [Constraint.PRIMARY_KEY, Constraint.UNIQUE]
+        }
+        
         # Create indexes for primary keys and unique constraints
-        for column in columns:
-            if column.constraint in [Constraint.PRIMARY_KEY, Constraint.UNIQUE]:
-                self.indexes[column.name] = Index(column.name)
+        for col_name in self._unique_columns:
+            self.indexes[col_name] = Index(col_name)
                 
+    @property
+    def rows(self) -> List[Dict[str, Any]]:
+        """All rows as dictionaries (built from the column lists on access)"""
+        return self._materialize(None)
+        
+    @property
+    def row_count(self) -> int:
+        """Number of rows stored in the table"""
+        return len(self.row_ids)
+        
     def insert_row(self, values: Dict[str, Any]) -> int:
         """Insert a new row and return its ID"""
-        # Validate all values
+        # Validate values and check PRIMARY KEY / UNIQUE constraints in a single pass
+        columns = self.columns
+        indexes = self.indexes
+        unique_columns = self._unique_columns
         for col_name, value in values.items():
-            if col_name not in self.columns:
+            column = columns.get(col_name)
+            if column is None:
                 raise ValueError(f"Unknown column: {col_name}")
-            if not self.columns[col_name].validate_value(value):
+            if not column.validate_value(value):
                 raise ValueError(f"Invalid value for column {col_name}: {value}")
-                
-        # Check constraints
-        for col_name, value in values.items():
-            column = self.columns[col_name]
+            
+            is_primary = unique_columns.get(col_name)
+            if is_primary is None:
+                continue
             
             # Check primary key uniqueness
-            if column.constraint == Constraint.PRIMARY_KEY:
+            if is_primary:
                 if value is None:
                     raise ValueError(f"Primary key {col_name} cannot be null")
-                if self.indexes[col_name].find(value):
+                if indexes[col_name].contains(value):
                     raise ValueError(f"Primary key violation: {col_name} = {value}")
                     
             # Check unique constraint
-            elif column.constraint == Constraint.UNIQUE and value is not None:
-                if self.indexes[col_name].find(value):
+            elif value is not None:
+                if indexes[col_name].contains(value):
                     raise ValueError(f"Unique constraint violation: {col_name} = {value}")
         
-        # Create row with default values for missing columns
-        row = {'_row_id': self.next_row_id}
-        for col_name, column in self.columns.items():
-            row[col_name] = values.get(col_name, None)
-            
-        # Add row to table
-        self.rows.append(row)
+        return self._store_row(values)
+        
+    def insert_many(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert several rows and return their IDs (all or nothing)"""
+        # Validate column names once for the whole batch
+        batch_columns = set()
+        for values in rows:
+            batch_columns.update(values)
+        for col_name in batch_columns:
+            if col_name not in self.columns:
+                raise ValueError(f"Unknown column: {col_name}")
+        
+        # Validate all values
+        for values in rows:
+            for col_name, value in values.items():
+                if not self.columns[col_name].validate_value(value):
+                    raise ValueError(f"Invalid value for column {col_name}: {value}")
+        
+        # Check constraints with one set operation per unique column
+        for col_name, is_primary in self._unique_columns.items():
+            if col_name in batch_columns:
+                self._check_unique_batch(col_name, is_primary,
+                                         [values[col_name] for values in rows if col_name in values])
+        
+        return [self._store_row(values) for values in rows]
+        
+    def insert_tuples(self, col_names: Sequence[str], rows: Sequence[Sequence[Any]]) -> List[int]:
+        """Insert rows given as value tuples in col_names order and return their IDs (all or nothing)"""
+        for col_name in col_names:
+            if col_name not in self.columns:
+                raise ValueError(f"Unknown column: {col_name}")
+        if len(set(col_names)) != len(col_names):
+            raise ValueError("Duplicate column in column list")
+        for values in rows:
+            if len(values) != len(col_names):
+                raise ValueError("Number of columns doesn't match number of values")
+        
+        # Work column by column: validate, check constraints, then append each list in one go
+        batch = dict(zip(col_names, zip(*rows))) if rows else {}
+        for col_name, column_values in batch.items():
+            column = self.columns[col_name]
+            for value in column_values:
+                if not column.validate_value(value):
+                    raise ValueError(f"Invalid value for column {col_name}: {value}")
+        
+        for col_name, is_primary in self._unique_columns.items():
+            if col_name in batch:
+                self._check_unique_batch(col_name, is_primary, batch[col_name])
+        
+        start = len(self.row_ids)
+        row_ids = list(range(self.next_row_id, self.next_row_id + len(rows)))
+        self.next_row_id += len(rows)
+        self.row_ids.extend(row_ids)
+        self._positions.update(zip(row_ids, range(start, start + len(rows))))
+        
+        missing = [None] * len(rows)
+        for col_name, column_values in self.columns_data.items():
+            column_values.extend(batch.get(col_name, missing))
+        for col_name, index in self.indexes.items():
+            for value, row_id in zip(batch.get(col_name, missing), row_ids):
+                index.add(value, row_id)
+        
+        return row_ids
+        
+    def _check_unique_batch(self, col_name: str, is_primary: bool, values: Sequence[Any]):
+        """Reject a batch of new values that repeat each other or the indexed values of col_name"""
+        label = "Primary key violation" if is_primary else "Unique constraint violation"
+        
+        batch_values = set()
+        for value in values:
+            if value is None:
+                if is_primary:
+                    raise ValueError(f"Primary key {col_name} cannot be null")
+                continue
+            if value in batch_values:
+                raise ValueError(f"{label}: {col_name} = {value}")
+            batch_values.add(value)
+        
+        clashes = batch_values & self.indexes[col_name].index.keys()
+        if clashes:
+            raise ValueError(f"{label}: {col_name} = {next(iter(clashes))}")
+        
+    def _store_row(self, values: Dict[str, Any]) -> int:
+        """Append an already validated row and index it"""
         row_id = self.next_row_id
         self.next_row_id += 1
         
+        # Append to every column, using NULL for missing columns
+        self._positions[row_id] = len(self.row_ids)
+        self.row_ids.append(row_id)
+        for col_name, column_values in self.columns_data.items():
+            column_values.append(values.get(col_name, None))
+        
         # Update indexes
-        for col_name, value in values.items():
-            if col_name in self.indexes:
-                self.indexes[col_name].add(value, row_id)
+        for col_name, index in self.indexes.items():
+            index.add(values.get(col_name, None), row_id)
                 
         return row_id
         
-    def find_rows(self, conditions: Dict[str, Any] = None) -> List[Dict[str, Any]]:
-        """Find rows matching given conditions"""
+    def _column_values(self, col_name: str) -> Optional[List[Any]]:
+        """Get the stored values of a column (or of _row_id)"""
+        if col_name == '_row_id':
+            return self.row_ids
+        return self.columns_data.get(col_name)
+        
+    def _match_positions(self, conditions: Optional[Dict[str, Any]]) -> Optional[List[int]]:
+        """Find positions of rows matching conditions (None means every row)"""
+        if not conditions:
+            return None
+        
+        # Scan the first unindexed column in C, then check the rest against its matches
+        positions, checks = self._plan_match(conditions)
+        if positions is None:
+            column_values, value = checks.pop(0)
+            positions = _scan_equal(column_values, value)
+        return _refine_equal(positions, checks)
+        
+    def _iter_positions(self, conditions: Optional[Dict[str, Any]]) -> Iterator[int]:
+        """Iterate positions of rows matching conditions, scanning only as far as the caller reads"""
         if not conditions:
-            return self.rows.copy()
+            return iter(range(len(self.row_ids)))
+        
+        positions, checks = self._plan_match(conditions)
+        if positions is None:
+            column_values, value = checks.pop(0)
+            positions = _iter_equal(column_values, value)
+        if not checks:
+            return iter(positions)
+        return (i for i in positions if all(values[i] == target for values, target in checks))
+        
+    def _plan_match(self, conditions: Dict[str, Any]) -> Tuple[Optional[List[int]], List[Tuple[List[Any], Any]]]:
+        """Resolve indexed conditions to candidate positions (None means every row) plus the column checks left"""
+        # Columns that keep getting filtered on earn an index
+        for col_name in conditions:
+            if col_name not in self.indexes:
+                self._count_filter(col_name)
+        
+        # Resolve indexed conditions by intersecting their row ID sets, most selective first
+        positions = None
+        remaining = conditions
+        postings = sorted((self.indexes[col_name].find(value) for col_name, value in conditions.items()
+                           if col_name in self.indexes), key=len)
+        if postings:
+            row_ids = postings[0].intersection(*postings[1:]) if len(postings) > 1 else postings[0]
+            positions = sorted(self._positions[row_id] for row_id in row_ids)
+            remaining = {c: v for c, v in conditions.items() if c not in self.indexes}
+        
+        checks = []
+        for col_name, value in remaining.items():
+            column_values = self._column_values(col_name)
+            if column_values is None:
+                return [], []
+            checks.append((column_values, value))
+        return positions, checks
+        
+    def _count_filter(self, col_name: str):
+        """Record an equality filter on a column and index it once it is filtered often"""
+        if col_name not in self.columns_data:
+            return
+        count = self._filter_counts.get(col_name, 0) + 1
+        self._filter_counts[col_name] = count
+        if count >= self.AUTO_INDEX_THRESHOLD:
+            self.create_index(col_name)
             
-        result = []
-        for row in self.rows:
-            match = True
-            for col_name, value in conditions.items():
-                if col_name not in row or row[col_name] != value:
-                    match = False
-                    break
-            if match:
-                result.append(row)
-        return result
+    def create_index(self, col_name: str) -> Index:
+        """Build a hash index over the current values of a column"""
+        if col_name not in self.columns:
+            raise ValueError(f"Unknown column: {col_name}")
+        if col_name in self.indexes:
+            return self.indexes[col_name]
+        
+        index = Index(col_name)
+        for row_id, value in zip(self.row_ids, self.columns_data[col_name]):
+            index.add(value, row_id)
+        self.indexes[col_name] = index
+        self._filter_counts.pop(col_name, None)
+        return index
+        
+    def _materialize(self, positions: Optional[List[int]], names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Build row dictionaries for the given positions and column names"""
+        keys = self._row_keys if names is None else names
+        columns = [self._column_values(name) for name in keys]
+        
+        if positions is not None:
+            columns = [[column_values[i] for i in positions] for column_values in columns]
+            count = len(positions)
+        else:
+            count = len(self.row_ids)
+        
+        if not keys:
+            return [{} for _ in range(count)]
+        return [dict(zip(keys, values)) for values in zip(*columns)]
+        
+    def find_rows(self, conditions: Dict[str, Any] = None, columns: Optional[List[str]] = None,
+                  order_by: Optional[str] = None, descending: bool = False,
+                  limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Find rows matching given conditions, optionally projected, ordered and limited"""
+        names = None
+        if columns is not None:
+            names = [name for name in columns if self._column_values(name) is not None]
+        
+        if order_by is not None:
+            order_values = self._column_values(order_by)
+            if order_values is None:
+                raise ValueError(f"Unknown column: {order_by}")
+            positions = self._match_positions(conditions)
+            if positions is None:
+                positions = range(len(self.row_ids))
+            positions = order_positions(positions, order_values, descending, limit)
+        elif limit is not None:
+            # Without ORDER BY the first matches in storage order are enough, so stop scanning there
+            return list(islice(self.iter_rows(conditions, columns), limit))
+        else:
+            positions = self._match_positions(conditions)
+        
+        # Only the rows that survive ordering and LIMIT are built
+        return self._materialize(positions, names)
+        
+    def iter_rows(self, conditions: Dict[str, Any] = None,
+                  columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield rows matching given conditions one at a time (the table must not change meanwhile)"""
+        keys = self._row_keys
+        if columns is not None:
+            keys = [name for name in columns if self._column_values(name) is not None]
+        column_lists = [(name, self._column_values(name)) for name in keys]
+        
+        for i in self._iter_positions(conditions):
+            yield {name: values[i] for name, values in column_lists}
+        
+    def find_positions(self, conditions: Dict[str, Any] = None) -> List[int]:
+        """Find storage positions of matching rows (valid until the table changes)"""
+        positions = self._match_positions(conditions)
+        if positions is None:
+            return list(range(len(self.row_ids)))
+        return positions
         
     def update_rows(self, conditions: Dict[str, Any], updates: Dict[str, Any]) -> int:
         """Update rows matching conditions and return count of updated rows"""
+        # Validate new values once, since they do not depend on the row being updated
+        for col_name, new_value in updates.items():
+            if col_name not in self.columns:
+                raise ValueError(f"Unknown column: {col_name}")
+            if not self.columns[col_name].validate_value(new_value):
+                raise ValueError(f"Invalid value for column {col_name}: {new_value}")
+        
         updated_count = 0
-        rows_to_update = self.find_rows(conditions)
+        positions = self._match_positions(conditions)
+        if positions is None:
+            positions = range(len(self.row_ids))
         
-        for row in rows_to_update:
-            row_id = row['_row_id']
-            
-            # Validate new values
-            for col_name, new_value in updates.items():
-                if col_name not in self.columns:
-                    raise ValueError(f"Unknown column: {col_name}")
-                if not self.columns[col_name].validate_value(new_value):
-                    raise ValueError(f"Invalid value for column {col_name}: {new_value}")
+        # Matching may have created an index, so look columns up only afterwards
+        changes = [(col_name, new_value, self.columns[col_name].constraint,
+                    self.columns_data[col_name], self.indexes.get(col_name))
+                   for col_name, new_value in updates.items()]
+        
+        for position in positions:
+            row_id = self.row_ids[position]
             
-            # Check constraints for updated values
-            for col_name, new_value in updates.items():
-                column = self.columns[col_name]
-                old_value = row[col_name]
+            # Check constraints for updated values before touching any index
+            pending = []
+            for col_name, new_value, constraint, column_values, index in changes:
+                old_value = column_values[position]
                 
                 # Only check if value is actually changing
                 if old_value == new_value:
                     continue
                     
-                # Remove from old index
-                if col_name in self.indexes:
-                    self.indexes[col_name].remove(old_value, row_id)
-                
                 # Check constraints
-                if column.constraint == Constraint.PRIMARY_KEY:
+                if constraint == Constraint.PRIMARY_KEY:
                     if new_value is None:
                         raise ValueError(f"Primary key {col_name} cannot be null")
-                    if self.indexes[col_name].find(new_value):
+                    if index.contains(new_value):
                         raise ValueError(f"Primary key violation: {col_name} = {new_value}")
                         
-                elif column.constraint == Constraint.UNIQUE and new_value is not None:
-                    if self.indexes[col_name].find(new_value):
+                elif constraint == Constraint.UNIQUE and new_value is not None:
+                    if index.contains(new_value):
                         raise ValueError(f"Unique constraint violation: {col_name} = {new_value}")
                 
+                pending.append((old_value, new_value, column_values, index))
+            
+            for old_value, new_value, column_values, index in pending:
                 # Update row
-                row[col_name] = new_value
+                column_values[position] = new_value
                 
-                # Add to new index
-                if col_name in self.indexes:
-                    self.indexes[col_name].add(new_value, row_id)
+                # Move the row to its new index entry
+                if index is not None:
+                    index.remove(old_value, row_id)
+                    index.add(new_value, row_id)
                     
             updated_count += 1
             
@@ -194,22 +535,44 @@ class Table:
         
     def delete_rows(self, conditions: Dict[str, Any]) -> int:
         """Delete rows matching conditions and return count of deleted rows"""
-        rows_to_delete = self.find_rows(conditions)
-        deleted_count = 0
+        positions = self._match_positions(conditions)
+        if positions is None:
+            positions = range(len(self.row_ids))
+        return self._delete_positions(positions)
         
-        for row in rows_to_delete:
-            row_id = row['_row_id']
-            
-            # Remove from indexes
-            for col_name in self.indexes:
-                if col_name in row:
-                    self.indexes[col_name].remove(row[col_name], row_id)
-            
-            # Remove from table
-            self.rows.remove(row)
-            deleted_count += 1
+    def delete_rows_by_index(self, col_name: str, value: Any) -> int:
+        """Delete rows where col_name equals value, building the column's index if needed"""
+        self.create_index(col_name)
+        return self._delete_positions(self.index_positions(col_name, value))
+        
+    def index_positions(self, col_name: str, value: Any) -> List[int]:
+        """Find storage positions of rows whose indexed column equals value (valid until the table changes)"""
+        return sorted(self._positions[row_id] for row_id in self.indexes[col_name].find(value))
+        
+    def _delete_positions(self, positions: List[int]) -> int:
+        """Delete the rows at the given positions and return how many were removed"""
+        if not positions:
+            return 0
+        
+        # Remove from indexes in bulk rather than one posting list removal per row
+        deleted_ids = [self.row_ids[position] for position in positions]
+        for col_name, index in self.indexes.items():
+            column_values = self.columns_data[col_name]
+            index.remove_many([column_values[position] for position in positions], deleted_ids)
+        
+        # Remove from table by copying the surviving runs of every column
+        deleted = sorted(set(positions))
+        self.row_ids = _compact(self.row_ids, deleted)
+        for col_name, column_values in self.columns_data.items():
+            self.columns_data[col_name] = _compact(column_values, deleted)
+        
+        # Only rows after the first deleted one have moved
+        for row_id in deleted_ids:
+            del self._positions[row_id]
+        first = deleted[0]
+        self._positions.update(zip(self.row_ids[first:], range(first, len(self.row_ids))))
             
-        return deleted_count
+        return len(deleted)
 
 
 class Database:
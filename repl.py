@@ -3,20 +3,77 @@ Interactive REPL (Read-Eval-Print-Loop) for Simple RDBMS
 Provides a command-line interface for executing SQL commands
 """
 
+import os
 import sys
-import traceback
+import atexit
 from typing import Optional
 
+try:
+    import readline
+except ImportError:  # not available on every platform
+    readline = None
+
 from database_engine import DatabaseEngine, QueryResult
 
 
 class RDBMSRepl:
     """Interactive REPL for the RDBMS"""
     
+    # Where readline keeps command history between sessions, and how many commands it keeps
+    HISTORY_FILE = os.path.expanduser('~/.minirdbms_history')
+    HISTORY_LENGTH = 1000
+    
+    # Text printed by .help, built once
+    HELP_TEXT = """\
+╔══════════════════════════════════════════════════════════════╗
+║                          HELP                                ║
+╠══════════════════════════════════════════════════════════════╣
+║ SQL Commands:                                               ║
+║                                                              ║
+║ CREATE TABLE:                                               ║
+║   CREATE TABLE users (                                      ║
+║     id INT PRIMARY_KEY,                                     ║
+║     name TEXT NOT NULL,                                     ║
+║     email TEXT UNIQUE                                       ║
+║   )                                                         ║
+║                                                              ║
+║ INSERT:                                                     ║
+║   INSERT INTO users (name, email) VALUES ('Alice', 'a@e.com')║
+║   INSERT INTO users (id, name) VALUES (1, 'A'), (2, 'B')   ║
+║                                                              ║
+║ SELECT:                                                     ║
+║   SELECT * FROM users                                       ║
+║   SELECT name FROM users WHERE id = 1                       ║
+║                                                              ║
+║ UPDATE:                                                     ║
+║   UPDATE users SET name = 'Bob' WHERE id = 1               ║
+║                                                              ║
+║ DELETE:                                                     ║
+║   DELETE FROM users WHERE id = 1                            ║
+║                                                              ║
+║ JOIN:                                                       ║
+║   SELECT * FROM users JOIN posts ON users.id = posts.user_id ║
+║                                                              ║
+║ Special Commands:                                           ║
+║   .tables      - List all tables                           ║
+║   .schema name - Show table structure                      ║
+║   .load f INTO t - Load CSV file f into table t            ║
+║   .debug on|off - Show tracebacks of unexpected errors      ║
+║   .history     - Show command history                       ║
+║   .exit/.quit  - Exit the REPL                             ║
+╚══════════════════════════════════════════════════════════════╝
+"""
+    
     def __init__(self):
         self.engine = DatabaseEngine()
         self.running = True
-        self.history = []
+        self.history = []  # only used when readline is not recording the input
+        self.debug = False  # print tracebacks of unexpected errors
+        
+        # Interactive sessions get readline's editing and persistent history
+        self.use_readline = readline is not None and sys.stdin.isatty()
+        if self.use_readline:
+            self._load_history()
         
         # Welcome message
         print("╔══════════════════════════════════════════════════════════════╗")
@@ -34,9 +91,11 @@ class RDBMSRepl:
         print("║  Special Commands:                                         ║")
         print("║  • .tables - List all tables                               ║")
         print("║  • .schema table_name - Show table structure              ║")
+        print("║  • .load file.csv INTO table - Bulk load a CSV file       ║")
         print("║  • .help - Show this help                                  ║")
         print("║  • .exit or .quit - Exit the REPL                         ║")
         print("║  • .history - Show command history                         ║")
+        print("║  • .debug on|off - Show tracebacks of unexpected errors   ║")
         print("╚══════════════════════════════════════════════════════════════╝")
         print()
     
@@ -50,8 +109,9 @@ class RDBMSRepl:
                 if not command.strip():
                     continue
                 
-                # Add to history
-                self.history.append(command)
+                # Add to history (readline records interactive input itself)
+                if not self.use_readline:
+                    self.history.append(command)
                 
                 # Handle special commands
                 if command.startswith('.'):
@@ -69,7 +129,9 @@ class RDBMSRepl:
                 break
             except Exception as e:
                 print(f"Unexpected error: {e}")
-                traceback.print_exc()
+                if self.debug:
+                    import traceback
+                    traceback.print_exc()
     
     def _get_input(self) -> str:
         """Get input from user with prompt"""
@@ -106,6 +168,22 @@ class RDBMSRepl:
         elif cmd == '.history':
             self._show_history()
             
+        elif cmd == '.debug':
+            if len(parts) != 2 or parts[1].lower() not in ('on', 'off'):
+                print("Usage: .debug on|off")
+                return
+            
+            self.debug = parts[1].lower() == 'on'
+            print(f"Debug mode {'on' if self.debug else 'off'}")
+            
+        elif cmd == '.load':
+            if len(parts) != 4 or parts[2].upper() != 'INTO':
+                print("Usage: .load file.csv INTO table_name")
+                return
+            
+            result = self.engine.load_csv(parts[1], parts[3])
+            self._display_result(result)
+            
         else:
             print(f"Unknown command: {command}")
             print("Type .help for available commands")
@@ -133,78 +211,54 @@ class RDBMSRepl:
         # Get all column names
         columns = list(data[0].keys())
         
-        # Calculate column widths
-        widths = {}
-        for col in columns:
-            widths[col] = max(len(str(col)), 8)  # Minimum width of 8
-            
-        for row in data:
-            for col in columns:
-                value = str(row.get(col, 'NULL'))
-                widths[col] = max(widths[col], len(value))
-        
-        # Create separator line
-        separator = "+" + "+".join("-" * (widths[col] + 2) for col in columns) + "+"
+        # Convert every cell to a string once, then size each column to its widest cell
+        cells = [[str(row.get(col, 'NULL')) for col in columns] for row in data]
+        widths = [max(len(str(col)), 8, *map(len, column_cells))  # Minimum width of 8
+                  for col, column_cells in zip(columns, zip(*cells))]
         
-        # Print header
-        print(separator)
-        header = "|" + "|".join(f" {col:^{widths[col]}} " for col in columns) + "|"
-        print(header)
-        print(separator)
+        # Create separator line and a format string that pads every cell of a row
+        separator = "+" + "+".join("-" * (width + 2) for width in widths) + "+"
+        row_format = "|" + "|".join(f" {{:^{width}}} " for width in widths) + "|"
         
-        # Print rows
-        for row in data:
-            row_str = "|" + "|".join(f" {str(row.get(col, 'NULL')):^{widths[col]}} " for col in columns) + "|"
-            print(row_str)
+        # Collect header and rows, then write the whole table at once
+        lines = [separator, row_format.format(*columns), separator]
+        lines.extend(row_format.format(*row_cells) for row_cells in cells)
         
-        print(separator)
-        print(f"({len(data)} rows)")
+        lines.append(separator)
+        lines.append(f"({len(data)} rows)")
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def _show_help(self):
         """Show help information"""
-        print("╔══════════════════════════════════════════════════════════════╗")
-        print("║                          HELP                                ║")
-        print("╠══════════════════════════════════════════════════════════════╣")
-        print("║ SQL Commands:                                               ║")
-        print("║                                                              ║")
-        print("║ CREATE TABLE:                                               ║")
-        print("║   CREATE TABLE users (                                      ║")
-        print("║     id INT PRIMARY_KEY,                                     ║")
-        print("║     name TEXT NOT NULL,                                     ║")
-        print("║     email TEXT UNIQUE                                       ║")
-        print("║   )                                                         ║")
-        print("║                                                              ║")
-        print("║ INSERT:                                                     ║")
-        print("║   INSERT INTO users (name, email) VALUES ('Alice', 'a@e.com')║")
-        print("║                                                              ║")
-        print("║ SELECT:                                                     ║")
-        print("║   SELECT * FROM users                                       ║")
-        print("║   SELECT name FROM users WHERE id = 1                       ║")
-        print("║                                                              ║")
-        print("║ UPDATE:                                                     ║")
-        print("║   UPDATE users SET name = 'Bob' WHERE id = 1               ║")
-        print("║                                                              ║")
-        print("║ DELETE:                                                     ║")
-        print("║   DELETE FROM users WHERE id = 1                            ║")
-        print("║                                                              ║")
-        print("║ JOIN:                                                       ║")
-        print("║   SELECT * FROM users JOIN posts ON users.id = posts.user_id ║")
-        print("║                                                              ║")
-        print("║ Special Commands:                                           ║")
-        print("║   .tables      - List all tables                           ║")
-        print("║   .schema name - Show table structure                      ║")
-        print("║   .history     - Show command history                       ║")
-        print("║   .exit/.quit  - Exit the REPL                             ║")
-        print("╚══════════════════════════════════════════════════════════════╝")
-        print()
+        print(self.HELP_TEXT)
     
     def _show_history(self):
         """Show command history"""
         print("Command History:")
         print("-" * 50)
-        for i, cmd in enumerate(self.history, 1):
+        if self.use_readline:
+            commands = [readline.get_history_item(i) for i in range(1, readline.get_current_history_length() + 1)]
+        else:
+            commands = self.history
+        for i, cmd in enumerate(commands, 1):
             print(f"{i:3d}: {cmd}")
         print()
+    
+    def _load_history(self):
+        """Load command history from earlier sessions and save it again on exit"""
+        try:
+            readline.read_history_file(self.HISTORY_FILE)
+        except OSError:
+            pass
+        readline.set_history_length(self.HISTORY_LENGTH)
+        atexit.register(self._save_history)
+    
+    def _save_history(self):
+        """Write command history for the next session"""
+        try:
+            readline.write_history_file(self.HISTORY_FILE)
+        except OSError:
+            pass
 
 
 def main():
@@ -4,8 +4,10 @@ Handles parsing of basic SQL commands into structured operations
 """
 
 import re
-from typing import Dict, List, Any, Optional, Union
-from dataclasses import dataclass
+import sys
+from itertools import count
+from typing import Dict, List, Any, Optional, Union, Sequence
+from dataclasses import dataclass, field, fields, replace
 from enum import Enum
 
 from rdbms import DataType, Constraint, Column
@@ -21,6 +23,68 @@ class CommandType(Enum):
     JOIN = "JOIN"
 
 
+# A quoted string literal: '' and a backslash before a quote do not end it,
+# and an unterminated literal runs to the end of the text
+_STRING_LITERAL = r"'(?:[^'\\]|\\'?|'')*(?:'|$)"
+
+
+# A quoted string literal or a ? parameter marker
+_PLACEHOLDER_SCAN = re.compile(_STRING_LITERAL + r"|\?")
+
+
+# A quoted string literal or a comma that ends a value in a VALUES list
+_VALUE_SEPARATORS = re.compile(_STRING_LITERAL + r"|,")
+
+
+# A quoted string literal or the "), (" between the rows of a multi-row VALUES clause
+_ROW_SEPARATORS = re.compile(_STRING_LITERAL + r"|\)\s*,\s*\(")
+
+
+# Characters besides digits that can start a numeric literal
+_NUMBER_SIGNS = frozenset('+-.')
+
+
+# Spellings of the primary key constraint in CREATE TABLE
+_PRIMARY_KEY_TOKENS = frozenset({'PRIMARY_KEY', 'PRIMARY'})
+
+
+# Statement keyword, named after the command pattern it selects
+_KEYWORD_PATTERN = re.compile(
+    r'(?P<create_table>CREATE)|(?P<insert>INSERT)|(?P<select>SELECT)|(?P<update>UPDATE)|(?P<delete>DELETE)',
+    re.IGNORECASE
+)
+
+_COMMAND_PATTERNS = {
+    'create_table': re.compile(
+        r'^CREATE\s+TABLE\s+(\w+)\s*\(\s*(.+?)\s*\)$', 
+        re.IGNORECASE
+    ),
+    'insert': re.compile(
+        r'^INSERT\s+INTO\s+(\w+)\s*\((.*?)\)\s*VALUES\s*\((.*?)\)$', 
+        re.IGNORECASE
+    ),
+    'select': re.compile(
+        r'^SELECT\s+(.*?)\s+FROM\s+(\w+)(?:\s+WHERE\s+(.+?))?(?:\s+JOIN\s+(\w+)\s+ON\s+(.+?))?'
+        r'(?:\s+ORDER\s+BY\s+([\w.]+)(?:\s+(ASC|DESC))?)?(?:\s+LIMIT\s+(\d+))?$', 
+        re.IGNORECASE
+    ),
+    'update': re.compile(
+        r'^UPDATE\s+(\w+)\s+SET\s+(.+?)(?:\s+WHERE\s+(.+?))?$', 
+        re.IGNORECASE
+    ),
+    'delete': re.compile(
+        r'^DELETE\s+FROM\s+(\w+)(?:\s+WHERE\s+(.+?))?$', 
+        re.IGNORECASE
+    )
+}
+
+
+@dataclass(frozen=True)
+class Placeholder:
+    """A ? parameter slot in a parsed command, filled in by bind_parameters"""
+    index: int
+
+
 @dataclass
 class CreateTableCommand:
     """Command for creating a table"""
@@ -33,6 +97,7 @@ class InsertCommand:
     """Command for inserting data"""
     table_name: str
     values: Dict[str, Any]
+    more_values: List[Dict[str, Any]] = field(default_factory=list)  # further rows of a multi-row INSERT
 
 
 @dataclass
@@ -43,6 +108,11 @@ class SelectCommand:
     where_conditions: Optional[Dict[str, Any]] = None
     join_table: Optional[str] = None
     join_conditions: Optional[Dict[str, Any]] = None
+    order_by: Optional[str] = None
+    order_desc: bool = False
+    limit: Optional[int] = None
+    left_where: Optional[Dict[str, Any]] = None  # WHERE conditions qualified with table_name in a JOIN
+    right_where: Optional[Dict[str, Any]] = None  # WHERE conditions qualified with join_table in a JOIN
 
 
 @dataclass
@@ -60,31 +130,19 @@ class DeleteCommand:
     where_conditions: Optional[Dict[str, Any]] = None
 
 
+Command = Union[CreateTableCommand, InsertCommand, SelectCommand, UpdateCommand, DeleteCommand]
+
+
 class SQLParser:
     """Simple SQL parser for basic commands"""
     
     def __init__(self):
-        self.patterns = {
-            'create_table': re.compile(
-                r'^CREATE\s+TABLE\s+(\w+)\s*\(\s*(.+?)\s*\)$', 
-                re.IGNORECASE
-            ),
-            'insert': re.compile(
-                r'^INSERT\s+INTO\s+(\w+)\s*\((.*?)\)\s*VALUES\s*\((.*?)\)$', 
-                re.IGNORECASE
-            ),
-            'select': re.compile(
-                r'^SELECT\s+(.*?)\s+FROM\s+(\w+)(?:\s+WHERE\s+(.+?))?(?:\s+JOIN\s+(\w+)\s+ON\s+(.+?))?$', 
-                re.IGNORECASE
-            ),
-            'update': re.compile(
-                r'^UPDATE\s+(\w+)\s+SET\s+(.+?)(?:\s+WHERE\s+(.+?))?$', 
-                re.IGNORECASE
-            ),
-            'delete': re.compile(
-                r'^DELETE\s+FROM\s+(\w+)(?:\s+WHERE\s+(.+?))?$', 
-                re.IGNORECASE
-            )
+        self.parsers = {
+            'create_table': self._parse_create_table,
+            'insert': self._parse_insert,
+            'select': self._parse_select,
+            'update': self._parse_update,
+            'delete': self._parse_delete
         }
     
     def parse(self, sql: str) -> Union[CreateTableCommand, InsertCommand, SelectCommand, 
@@ -93,23 +151,53 @@ class SQLParser:
         # Normalize SQL - remove extra whitespace and newlines
         sql = ' '.join(sql.split()).strip()
         
-        # Try to match each command type
-        for command_type, pattern in self.patterns.items():
-            match = pattern.match(sql)
+        # Number ? parameters (outside string literals) as ?0, ?1, ...
+        numbered = sql
+        if '?' in sql:
+            positions = count()
+            numbered = _PLACEHOLDER_SCAN.sub(
+                lambda m: m.group(0) if m.group(0) != '?' else f"?{next(positions)}", sql)
+        
+        # The leading keyword selects the only command pattern worth trying
+        keyword = _KEYWORD_PATTERN.match(numbered)
+        if keyword:
+            command_type = keyword.lastgroup
+            match = _COMMAND_PATTERNS[command_type].match(numbered)
             if match:
-                if command_type == 'create_table':
-                    return self._parse_create_table(match)
-                elif command_type == 'insert':
-                    return self._parse_insert(match)
-                elif command_type == 'select':
-                    return self._parse_select(match)
-                elif command_type == 'update':
-                    return self._parse_update(match)
-                elif command_type == 'delete':
-                    return self._parse_delete(match)
+                return self.parsers[command_type](match)
         
         raise ValueError(f"Unsupported SQL syntax: {sql}")
     
+    def bind_parameters(self, command: Command, params: Optional[Sequence[Any]]) -> Command:
+        """Return a copy of command with its ? placeholders replaced by params"""
+        params = tuple(params) if params is not None else ()
+        
+        # Find the condition/value dicts (or lists of row dicts) that contain placeholders
+        slots = {}
+        expected = 0
+        for command_field in fields(command):
+            value = getattr(command, command_field.name)
+            found = sum(1 for values in (value if isinstance(value, list) else [value])
+                        if isinstance(values, dict)
+                        for v in values.values() if isinstance(v, Placeholder))
+            if found:
+                slots[command_field.name] = value
+                expected += found
+        
+        if expected != len(params):
+            raise ValueError(f"Expected {expected} parameters, got {len(params)}")
+        if not slots:
+            return command
+        
+        # The parsed command may be cached and shared, so never modify it in place
+        def bind(values: Dict[str, Any]) -> Dict[str, Any]:
+            return {key: params[v.index] if isinstance(v, Placeholder) else v for key, v in values.items()}
+        
+        bound = {}
+        for name, value in slots.items():
+            bound[name] = [bind(values) for values in value] if isinstance(value, list) else bind(value)
+        return replace(command, **bound)
+    
     def _parse_create_table(self, match) -> CreateTableCommand:
         """Parse CREATE TABLE command"""
         table_name = match.group(1)
@@ -123,8 +211,10 @@ class SQLParser:
             if len(parts) < 2:
                 raise ValueError(f"Invalid column definition: {col_def}")
             
-            col_name = parts[0]
-            col_type_str = parts[1].upper()
+            # Column names become dict keys everywhere, so keep a single shared copy of each
+            col_name = sys.intern(parts[0])
+            upper_parts = [part.upper() for part in parts]
+            col_type_str = upper_parts[1]
             
             # Parse data type
             if col_type_str == 'INT':
@@ -140,14 +230,13 @@ class SQLParser:
             constraint = Constraint.NONE
             nullable = True
             
-            for part in parts[2:]:
-                part_upper = part.upper()
-                if part_upper == 'PRIMARY_KEY' or part_upper == 'PRIMARY':
+            for i, part_upper in enumerate(upper_parts[2:], start=2):
+                if part_upper in _PRIMARY_KEY_TOKENS:
                     constraint = Constraint.PRIMARY_KEY
                     nullable = False
                 elif part_upper == 'UNIQUE':
                     constraint = Constraint.UNIQUE
-                elif part_upper == 'NOT' and len(parts) > parts.index(part) + 1 and parts[parts.index(part) + 1].upper() == 'NULL':
+                elif part_upper == 'NOT' and i + 1 < len(upper_parts) and upper_parts[i + 1] == 'NULL':
                     nullable = False
             
             columns.append(Column(col_name, data_type, constraint, nullable))
@@ -161,13 +250,18 @@ class SQLParser:
         values_str = match.group(3)
         
         columns = [col.strip() for col in columns_str.split(',')]
-        values = self._parse_values(values_str)
         
-        if len(columns) != len(values):
-            raise ValueError("Number of columns doesn't match number of values")
+        # VALUES (...), (...) inserts one row per parenthesised list
+        rows = []
+        for row_str in self._split_rows(values_str):
+            values = self._parse_values(row_str)
+            
+            if len(columns) != len(values):
+                raise ValueError("Number of columns doesn't match number of values")
+            
+            rows.append(dict(zip(columns, values)))
         
-        values_dict = dict(zip(columns, values))
-        return InsertCommand(table_name, values_dict)
+        return InsertCommand(table_name, rows[0], rows[1:])
     
     def _parse_select(self, match) -> SelectCommand:
         """Parse SELECT command"""
@@ -176,6 +270,9 @@ class SQLParser:
         where_str = match.group(3)
         join_table = match.group(4)
         join_condition_str = match.group(5)
+        order_by = match.group(6)
+        order_direction = match.group(7)
+        limit_str = match.group(8)
         
         # Parse columns
         if columns_str == '*':
@@ -193,12 +290,33 @@ class SQLParser:
         if join_condition_str:
             join_conditions = self._parse_conditions(join_condition_str)
         
+        # Push table-qualified WHERE conditions of a JOIN down to their table,
+        # leaving the rest (which need the table schemas) in where_conditions
+        left_where = None
+        right_where = None
+        if join_table and where_conditions:
+            left_where, right_where, residual = {}, {}, {}
+            for col, value in where_conditions.items():
+                qualifier, dot, col_name = col.partition('.')
+                if dot and qualifier == table_name:
+                    left_where[col_name] = value
+                elif dot and qualifier == join_table:
+                    right_where[col_name] = value
+                else:
+                    residual[col] = value
+            where_conditions = residual or None
+        
         return SelectCommand(
             table_name=table_name,
             columns=columns,
             where_conditions=where_conditions,
             join_table=join_table,
-            join_conditions=join_conditions
+            join_conditions=join_conditions,
+            order_by=order_by,
+            order_desc=bool(order_direction) and order_direction.upper() == 'DESC',
+            limit=int(limit_str) if limit_str is not None else None,
+            left_where=left_where or None,
+            right_where=right_where or None
         )
     
     def _parse_update(self, match) -> UpdateCommand:
@@ -253,32 +371,32 @@ class SQLParser:
         
         return conditions
     
+    def _split_rows(self, values_str: str) -> List[str]:
+        """Split the inside of VALUES (...), (...) into one value list per row"""
+        rows = []
+        start = 0
+        for separator in _ROW_SEPARATORS.finditer(values_str):
+            if separator.group().startswith(')'):
+                rows.append(values_str[start:separator.start()])
+                start = separator.end()
+        rows.append(values_str[start:])
+        return rows
+    
     def _parse_values(self, values_str: str) -> List[Any]:
         """Parse a comma-separated list of values"""
         values = []
         
-        # Simple parsing - split by comma and handle quotes
+        # Split by commas outside quotes, skipping over whole string literals
         parts = []
-        current = ''
-        in_quotes = False
+        start = 0
         
-        i = 0
-        while i < len(values_str):
-            char = values_str[i]
-            
-            if char == "'" and (i == 0 or values_str[i-1] != '\\'):
-                in_quotes = not in_quotes
-                current += char
-            elif char == ',' and not in_quotes:
-                parts.append(current.strip())
-                current = ''
-            else:
-                current += char
-            
-            i += 1
+        for separator in _VALUE_SEPARATORS.finditer(values_str):
+            if separator.group() == ',':
+                parts.append(values_str[start:separator.start()].strip())
+                start = separator.end()
         
-        if current:
-            parts.append(current.strip())
+        if start < len(values_str):
+            parts.append(values_str[start:].strip())
         
         # Parse each value
         for part in parts:
@@ -294,19 +412,26 @@ class SQLParser:
         if value_str.upper() == 'NULL':
             return None
         
+        # Handle ? parameters (numbered by parse)
+        if value_str.startswith('?') and value_str[1:].isdigit():
+            return Placeholder(int(value_str[1:]))
+        
         # Handle quoted strings
         if value_str.startswith("'") and value_str.endswith("'"):
             # Remove quotes and unescape
             return value_str[1:-1].replace("''", "'")
         
-        # Handle numbers
-        try:
-            if '.' in value_str:
-                return float(value_str)
-            else:
-                return int(value_str)
-        except ValueError:
-            pass
+        # Handle numbers, only trying conversion when the value starts like one
+        # so identifiers such as users.id never go through a raised ValueError
+        first = value_str[:1]
+        if first.isdigit() or first in _NUMBER_SIGNS:
+            try:
+                if '.' in value_str:
+                    return float(value_str)
+                else:
+                    return int(value_str)
+            except ValueError:
+                pass
         
         # Default to string
         return value_str